@@ -2,38 +2,38 @@ from typing import Dict, Any, List
 import os
 import csv
 
-def build_learning_path_payload(diagnosis_payload: Dict[str, Any]) -> Dict[str, Any]:
-    skill_gaps = diagnosis_payload.get("skill_gaps", [])
-    # Simple, deterministic design (you can later move this to LLM)
-    phases = []
+PRIORITY_RANK = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
+PRIORITY_HOURS = {"Critical": 40, "High": 24, "Medium": 16, "Low": 8}
 
-    # Prioritize by priority order
-    priority_rank = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
-    skill_gaps_sorted = sorted(
-        skill_gaps,
-        key=lambda s: priority_rank.get(s.get("priority", "Medium"), 2)
-    )
+FOUNDATIONS_WEEKS = 4
+APPLIED_WEEKS = 6
+IMPACT_WEEKS = 4
 
-    # Build phases
-    phases.append({
+def foundations_phase() -> Dict[str, Any]:
+    return {
         "phase": "Phase 1 — Foundations",
-        "duration_weeks": 4,
+        "duration_weeks": FOUNDATIONS_WEEKS,
         "modality": ["Self-paced", "Workshops"],
         "focus": ["Data literacy", "Core AI concepts", "Governance & ethics"],
-    })
-    phases.append({
+    }
+
+def applied_phase(duration_weeks: int, focus: List[str]) -> Dict[str, Any]:
+    return {
         "phase": "Phase 2 — Applied Capability",
-        "duration_weeks": 6,
+        "duration_weeks": duration_weeks,
         "modality": ["Project-based", "Mentoring"],
-        "focus": [s.get("skill") for s in skill_gaps_sorted[:6]],
-    })
-    phases.append({
+        "focus": focus,
+    }
+
+def impact_phase() -> Dict[str, Any]:
+    return {
         "phase": "Phase 3 — Impact & Scale",
-        "duration_weeks": 4,
+        "duration_weeks": IMPACT_WEEKS,
         "modality": ["Coaching", "Capstone"],
         "focus": ["Use-case delivery", "Change management", "KPI/ROI measurement"],
-    })
+    }
 
+def learning_path_payload(phases: List[Dict[str, Any]]) -> Dict[str, Any]:
     return {
         "overview": "Corporate learning path aligned with strategy and skill gaps.",
         "phases": phases,
@@ -44,6 +44,23 @@ def build_learning_path_payload(diagnosis_payload: Dict[str, Any]) -> Dict[str,
         }
     }
 
+def build_learning_path_payload(diagnosis_payload: Dict[str, Any]) -> Dict[str, Any]:
+    skill_gaps = diagnosis_payload.get("skill_gaps", [])
+    # Simple, deterministic design (you can later move this to LLM)
+
+    # Prioritize by priority order
+    skill_gaps_sorted = sorted(
+        skill_gaps,
+        key=lambda s: PRIORITY_RANK.get(s.get("priority", "Medium"), 2)
+    )
+
+    phases = [
+        foundations_phase(),
+        applied_phase(APPLIED_WEEKS, [s.get("skill") for s in skill_gaps_sorted[:6]]),
+        impact_phase(),
+    ]
+    return learning_path_payload(phases)
+
 def export_skills_csv(company_id: str, diagnosis_payload: Dict[str, Any], output_dir: str) -> str:
     os.makedirs(output_dir, exist_ok=True)
     path = os.path.join(output_dir, "skills_database.csv")
@@ -76,10 +93,4 @@ def export_skills_csv(company_id: str, diagnosis_payload: Dict[str, Any], output
 
 def estimate_hours(priority: str) -> int:
     # deterministic heuristic
-    if priority == "Critical":
-        return 40
-    if priority == "High":
-        return 24
-    if priority == "Medium":
-        return 16
-    return 8
+    return PRIORITY_HOURS.get(priority, PRIORITY_HOURS["Low"])
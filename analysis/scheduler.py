@@ -0,0 +1,218 @@
+from typing import Dict, Any, List, Optional
+import heapq
+import numpy as np
+
+from analysis.learning_path import (
+    PRIORITY_RANK, FOUNDATIONS_WEEKS, APPLIED_WEEKS, IMPACT_WEEKS,
+    estimate_hours, foundations_phase, applied_phase, impact_phase, learning_path_payload,
+)
+
+def _topological_order(skills: List[str], prerequisites: Dict[str, List[str]], rank: Dict[str, int]) -> List[str]:
+    """
+    Kahn's algorithm; among skills that are ready, higher priority goes first.
+    Prerequisites that are not skill gaps are ignored (already mastered).
+    """
+    known = set(skills)
+    deps = {s: [p for p in prerequisites.get(s, []) if p in known and p != s] for s in skills}
+    indegree = {s: len(deps[s]) for s in skills}
+    children: Dict[str, List[str]] = {s: [] for s in skills}
+    for s, ps in deps.items():
+        for p in ps:
+            children[p].append(s)
+
+    position = {s: i for i, s in enumerate(skills)}
+    ready = [(rank[s], position[s], s) for s in skills if indegree[s] == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, _, s = heapq.heappop(ready)
+        order.append(s)
+        for c in children[s]:
+            indegree[c] -= 1
+            if indegree[c] == 0:
+                heapq.heappush(ready, (rank[c], position[c], c))
+
+    if len(order) != len(skills):
+        cyclic = sorted(s for s in skills if indegree[s] > 0)
+        raise ValueError(f"Skill prerequisites contain a cycle: {cyclic}")
+    return order
+
+def _schedule_skill(earliest: np.ndarray, sizes: np.ndarray, duration: int, seats: Optional[int]):
+    """
+    Runs back-to-back waves of at most `seats` learners lasting `duration`
+    weeks. Each wave starts as soon as the previous one has ended and the next
+    waiting learner is ready, and takes every learner ready by then (up to
+    `seats`), so partial waves start rather than wait to fill. Cohorts are
+    taken in order of readiness and may span waves.
+    Returns per-cohort (start, finish) and per-wave (start, learners).
+    """
+    if seats is None:
+        start = earliest.copy()
+        return start, start + duration, start, sizes.copy()
+    if int(sizes.sum()) == 0:
+        return earliest.copy(), earliest.copy(), earliest[:0].copy(), sizes[:0].copy()
+
+    order = np.argsort(earliest, kind="stable")
+    e_sorted = earliest[order]
+    cum = np.cumsum(sizes[order])
+    total = int(cum[-1])
+
+    wave_start: List[int] = []
+    wave_learners: List[int] = []
+    pos = 0  # learners (in readiness order) already placed
+    free_at = int(e_sorted[0])
+    while pos < total:
+        t = max(free_at, int(e_sorted[np.searchsorted(cum, pos, side="right")]))
+        ready_by_t = int(cum[np.searchsorted(e_sorted, t, side="right") - 1])
+        take = min(seats, ready_by_t - pos)
+        wave_start.append(t)
+        wave_learners.append(take)
+        pos += take
+        free_at = t + duration
+
+    starts = np.array(wave_start, dtype=np.int64)
+    learners = np.array(wave_learners, dtype=np.int64)
+    wave_end_pos = np.cumsum(learners)
+    first_wave = np.searchsorted(wave_end_pos, cum - sizes[order], side="right")
+    last_wave = np.searchsorted(wave_end_pos, cum - 1, side="right")
+    start = np.empty_like(earliest)
+    finish = np.empty_like(earliest)
+    start[order] = starts[np.minimum(first_wave, len(starts) - 1)]
+    finish[order] = starts[last_wave] + duration
+    # Empty cohorts take no seats
+    empty = sizes == 0
+    start[empty] = earliest[empty]
+    finish[empty] = earliest[empty]
+    return start, finish, starts, learners
+
+def schedule_learning_path(
+    diagnosis_payload: Dict[str, Any],
+    cohorts: Optional[List[Dict[str, Any]]] = None,
+    prerequisites: Optional[Dict[str, List[str]]] = None,
+    capacity: Optional[Dict[str, int]] = None,
+    hours_per_week: int = 4,
+    include_assignments: bool = True,
+) -> Dict[str, Any]:
+    """
+    Week-by-week cohort schedule for the skill gaps in a diagnosis.
+
+    cohorts:        [{"cohort": name, "size": learners, "skills": [...optional subset]}]
+    prerequisites:  {skill: [skills that must be completed first]}
+    capacity:       {skill: seats per wave}; "default" applies to unlisted skills.
+                    Skills without capacity run for every cohort as soon as it is ready.
+
+    Each cohort takes its skills one at a time, in prerequisite/priority order,
+    spending the whole `hours_per_week` budget on the current skill; a skill
+    starts only after the cohort has finished the one before it.
+
+    Returns the build_learning_path_payload shape with Phase 2 sized to the
+    schedule, plus a "schedule" section. Weeks are counted from program start.
+    """
+    skill_gaps = [s for s in diagnosis_payload.get("skill_gaps", []) if s.get("skill")]
+    cohorts = cohorts or [{"cohort": "All employees", "size": 1}]
+    prerequisites = prerequisites or {}
+    capacity = capacity or {}
+    for key, seats in capacity.items():
+        if seats is not None and int(seats) <= 0:
+            raise ValueError(f"Capacity for {key!r} must be a positive number of seats, got {seats!r}.")
+    hours_per_week = max(1, int(hours_per_week))
+
+    skills = list(dict.fromkeys(s["skill"] for s in skill_gaps))
+    by_skill = {s["skill"]: s for s in skill_gaps}
+    rank = {k: PRIORITY_RANK.get(by_skill[k].get("priority", "Medium"), 2) for k in skills}
+    order = _topological_order(skills, prerequisites, rank)
+    col = {s: j for j, s in enumerate(order)}
+
+    names = [str(c.get("cohort", f"Cohort {i + 1}")) for i, c in enumerate(cohorts)]
+    sizes = np.array([max(0, int(c.get("size", 1))) for c in cohorts], dtype=np.int64)
+
+    # needs[c, j]: cohort c must take skill order[j]
+    needs = np.zeros((len(cohorts), len(order)), dtype=bool)
+    for i, c in enumerate(cohorts):
+        subset = c.get("skills")
+        if subset is None:
+            needs[i, :] = True
+        else:
+            needs[i, [col[s] for s in subset if s in col]] = True
+    needs &= (sizes > 0)[:, None]
+
+    # finish[c, j]: week cohort c completes skill j
+    # ready[c]: week cohort c finishes its previous skill (skills are taken one at a time)
+    phase2_start = FOUNDATIONS_WEEKS
+    finish = np.full(needs.shape, phase2_start, dtype=np.int64)
+    ready = np.full(len(cohorts), phase2_start, dtype=np.int64)
+    start = np.full(needs.shape, -1, dtype=np.int64)
+    horizon = phase2_start
+    skill_rows = []
+    weekly_delta: Dict[int, int] = {}
+
+    for j, skill in enumerate(order):
+        takers = np.flatnonzero(needs[:, j])
+        if takers.size == 0:
+            continue
+        hours = estimate_hours(by_skill[skill].get("priority", "Medium"))
+        duration = -(-hours // hours_per_week)
+        seats = capacity.get(skill, capacity.get("default"))
+        seats = int(seats) if seats is not None else None
+
+        # Prerequisites come earlier in `order`, so ready[] already covers them
+        pre = [col[p] for p in prerequisites.get(skill, []) if p in col and p != skill]
+        earliest = ready[takers]
+
+        s_start, s_finish, wave_start, wave_learners = _schedule_skill(earliest, sizes[takers], duration, seats)
+        start[takers, j] = s_start
+        finish[takers, j] = s_finish
+        ready[takers] = s_finish
+        horizon = max(horizon, int(s_finish.max()))
+
+        for ws, wl in zip(wave_start.tolist(), wave_learners.tolist()):
+            weekly_delta[ws] = weekly_delta.get(ws, 0) + wl
+            weekly_delta[ws + duration] = weekly_delta.get(ws + duration, 0) - wl
+
+        skill_rows.append({
+            "skill": skill,
+            "priority": by_skill[skill].get("priority", "Medium"),
+            "prerequisites": [order[p] for p in pre],
+            "duration_weeks": duration,
+            "seats_per_wave": seats,
+            "waves": int(wave_start.size),
+            "learners": int(sizes[takers].sum()),
+            "start_week": int(s_start.min()),
+            "end_week": int(s_finish.max()),
+        })
+
+    delta = np.zeros(horizon + 1, dtype=np.int64)
+    for week, d in weekly_delta.items():
+        delta[week] += d
+    weekly_enrollment = np.cumsum(delta)[:horizon].tolist()
+
+    # Nothing scheduled: keep the baseline Phase 2 length
+    applied_weeks = horizon - phase2_start if skill_rows else APPLIED_WEEKS
+
+    schedule: Dict[str, Any] = {
+        "makespan_weeks": phase2_start + applied_weeks + IMPACT_WEEKS,
+        "hours_per_week": hours_per_week,
+        "skills": skill_rows,
+        "weekly_enrollment": [int(x) for x in weekly_enrollment],
+    }
+    if include_assignments:
+        rows, cols = np.nonzero(needs)
+        schedule["assignments"] = [
+            {
+                "cohort": names[r],
+                "skill": order[c],
+                "start_week": int(start[r, c]),
+                "end_week": int(finish[r, c]),
+            }
+            for r, c in zip(rows.tolist(), cols.tolist())
+        ]
+
+    focus = [r["skill"] for r in sorted(skill_rows, key=lambda r: (r["start_week"], PRIORITY_RANK.get(r["priority"], 2)))]
+    phases = [
+        foundations_phase(),
+        applied_phase(applied_weeks, focus),
+        impact_phase(),
+    ]
+    payload = learning_path_payload(phases)
+    payload["schedule"] = schedule
+    return payload
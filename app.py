@@ -6,7 +6,7 @@ import streamlit as st
 
 from config import APP_TITLE, OUTPUT_DIR, DOCS_DIR
 from ocr.ocr_engine import ocr_image_bytes
-from rag.ingest import build_vector_store
+from rag.index_manager import get_index_manager
 from rag.retriever import retrieve_context
 from llm.groq_client import groq_chat
 from analysis.learning_path import build_learning_path_payload
@@ -143,8 +143,15 @@ if run_btn:
 
     st.success(f"Extracted text from {len(extracted_texts)} document(s). Building RAG index...")
 
-    # ---- Build vector store ----
-    index, chunks, embedder = build_vector_store(extracted_texts)
+    # ---- Build vector store (persisted per company, reused if the documents are unchanged) ----
+    index_manager = get_index_manager()
+    try:
+        index, chunks, embedder = index_manager.get_or_build(
+            export_company_id, extracted_texts, doc_names=[m["filename"] for m in doc_meta]
+        )
+    except ValueError as e:
+        st.error(f"Could not build the RAG index: {e}")
+        st.stop()
 
     # ---- Create a combined query ----
     inferred_context_query = (
@@ -162,7 +169,8 @@ if run_btn:
         index=index,
         chunks=chunks,
         embedder=embedder,
-        top_k=top_k
+        top_k=top_k,
+        index_version=index_manager.index_version(export_company_id),
     )
 
     rag_context = "\n\n".join([f"- {c}" for c in context_chunks])
@@ -0,0 +1,103 @@
+"""
+Near-duplicate chunk elimination benchmark.
+
+Builds a synthetic corporate corpus with repeated headers, legal footers, a
+policy section copied with small edits into every document, and "PDF" exports
+of half the documents with word edits and a page header that shifts chunk
+boundaries. Reports exact and near-duplicate drops separately, the chunk
+reduction ratio and the embedding time saved by deduplicating first.
+
+Run from the repo root:
+    python -m benchmarks.dedup_benchmark
+"""
+import random
+import time
+
+from sentence_transformers import SentenceTransformer
+
+from rag.ingest import _chunk_text, EMBEDDER_MODEL
+from rag.dedup import dedup_chunks, _normalize
+
+HEADER = "ACME Corporation — Internal Use Only — Human Resources Division. "
+FOOTER = ("This document is confidential and proprietary. Unauthorized distribution is "
+          "prohibited. All rights reserved. Contact legal@acme.example for permissions. ")
+
+
+def _paragraph(rng: random.Random, words: int = 120) -> str:
+    vocab = ["strategy", "skills", "training", "analytics", "leadership", "customer",
+             "operations", "governance", "innovation", "data", "roles", "mentoring",
+             "platform", "quality", "process", "delivery", "risk", "compliance"]
+    return " ".join(rng.choice(vocab) for _ in range(words)) + ". "
+
+
+def _edit_words(rng: random.Random, text: str, rate: float) -> str:
+    # Small wording changes: replace a fraction of words with a variant
+    words = text.split(" ")
+    for i in range(len(words)):
+        if words[i] and rng.random() < rate:
+            words[i] = words[i] + "s"
+    return " ".join(words)
+
+
+def build_corpus(n_docs: int = 40, seed: int = 0):
+    rng = random.Random(seed)
+    policy = "".join(_paragraph(rng) for _ in range(6))
+    docs = []
+    for _ in range(n_docs):
+        body = "".join(_paragraph(rng) for _ in range(4))
+        # Each document carries its own lightly edited copy of the shared policy
+        docs.append(HEADER * 3 + body + _edit_words(rng, policy, 0.01) + FOOTER * 4)
+    # PDF exports: a page header of varying length shifts every chunk
+    # boundary, and the text picks up a few word-level differences
+    for i, d in enumerate(docs[: n_docs // 2]):
+        page_header = f"Page 1 of {10 + i} — exported from PDF on 2024-{1 + i % 12:02d}-15. " + "x" * (i * 7 % 50)
+        docs.append(page_header + _edit_words(rng, d, 0.01))
+    return docs
+
+
+def main():
+    docs = build_corpus()
+    chunks = []
+    for d in docs:
+        chunks.extend(_chunk_text(d))
+
+    t0 = time.perf_counter()
+    kept, duplicates = dedup_chunks(chunks)
+    dedup_s = time.perf_counter() - t0
+
+    # Dropped chunks whose normalized text matches an earlier chunk exactly;
+    # the rest were caught by MinHash/LSH
+    seen = set()
+    exact = 0
+    for i, c in enumerate(chunks):
+        norm = _normalize(c)
+        if i in duplicates and norm in seen:
+            exact += 1
+        seen.add(norm)
+
+    print(f"chunks:            {len(chunks)}")
+    print(f"kept:              {len(kept)}")
+    print(f"dropped:           {len(duplicates)}")
+    print(f"  exact:           {exact}")
+    print(f"  near-duplicate:  {len(duplicates) - exact}")
+    print(f"reduction ratio:   {1 - len(kept) / len(chunks):.1%}")
+    print(f"dedup time:        {dedup_s:.3f}s")
+
+    embedder = SentenceTransformer(EMBEDDER_MODEL)
+    embedder.encode(chunks[:8], normalize_embeddings=True)  # warm-up
+
+    t0 = time.perf_counter()
+    embedder.encode(chunks, normalize_embeddings=True)
+    full_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    embedder.encode(kept, normalize_embeddings=True)
+    kept_s = time.perf_counter() - t0
+
+    print(f"embed all:         {full_s:.3f}s")
+    print(f"embed deduped:     {kept_s:.3f}s (+{dedup_s:.3f}s dedup)")
+    print(f"embed-time saving: {1 - (kept_s + dedup_s) / full_s:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,3 +8,7 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 DOCS_DIR = os.path.join(DATA_DIR, "company_docs")
 OUTPUT_DIR = os.path.join(DATA_DIR, "outputs")
 
+INDEX_DIR = os.path.join(DATA_DIR, "indexes")
+
+# Memory budget for company indexes kept resident by the index manager
+INDEX_CACHE_MAX_BYTES = int(os.environ.get("INDEX_CACHE_MAX_BYTES", 512 * 1024 * 1024))
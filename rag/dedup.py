@@ -0,0 +1,93 @@
+from typing import List, Dict, Tuple
+import hashlib
+import zlib
+import numpy as np
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_MAX_HASH = np.uint64(2**32 - 1)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _shingles(text: str, k: int) -> np.ndarray:
+    words = text.split()
+    if len(words) < k:
+        grams = [" ".join(words)] if words else [""]
+    else:
+        grams = [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+    return np.array(sorted({zlib.crc32(g.encode("utf-8")) for g in grams}), dtype=np.uint64)
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2**32 - 1, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2**32 - 1, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: np.ndarray) -> np.ndarray:
+        # (a * x + b) mod p for every permutation x shingle, then min per permutation
+        h = (self.a[:, None] * shingles[None, :] + self.b[:, None]) % _PRIME
+        return np.minimum(h, _MAX_HASH).min(axis=1)
+
+
+def dedup_chunks(
+    chunks: List[str],
+    threshold: float = 0.85,
+    num_perm: int = 64,
+    bands: int = 8,
+    shingle_size: int = 3,
+) -> Tuple[List[str], Dict[int, int]]:
+    """
+    Drops exact and near-duplicate chunks (MinHash + LSH banding over word
+    shingles). The first occurrence of each group is kept as canonical.
+
+    Returns:
+      kept: canonical chunks, in original order
+      duplicates: {position of dropped chunk in `chunks`: position of its canonical in `kept`}
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands.")
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm)
+
+    kept: List[str] = []
+    kept_sigs: List[np.ndarray] = []
+    duplicates: Dict[int, int] = {}
+    exact: Dict[str, int] = {}
+    buckets: List[Dict[bytes, List[int]]] = [dict() for _ in range(bands)]
+
+    for i, chunk in enumerate(chunks):
+        norm = _normalize(chunk)
+        digest = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+        if digest in exact:
+            duplicates[i] = exact[digest]
+            continue
+
+        sig = hasher.signature(_shingles(norm, shingle_size))
+        keys = [sig[b * rows:(b + 1) * rows].tobytes() for b in range(bands)]
+
+        candidates = set()
+        for b, key in enumerate(keys):
+            candidates.update(buckets[b].get(key, ()))
+
+        best, best_sim = None, threshold
+        for c in sorted(candidates):
+            sim = float(np.mean(kept_sigs[c] == sig))
+            if sim >= best_sim:
+                best, best_sim = c, sim
+
+        if best is not None:
+            duplicates[i] = best
+            exact[digest] = best
+            continue
+
+        k = len(kept)
+        kept.append(chunk)
+        kept_sigs.append(sig)
+        exact[digest] = k
+        for b, key in enumerate(keys):
+            buckets[b].setdefault(key, []).append(k)
+
+    return kept, duplicates
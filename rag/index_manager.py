@@ -0,0 +1,330 @@
+from typing import List, Dict, Any, Tuple, Optional, Iterable
+from collections import OrderedDict
+import os
+import json
+import hashlib
+import time
+import uuid
+import shutil
+import threading
+import faiss
+from sentence_transformers import SentenceTransformer
+
+from config import INDEX_DIR, INDEX_CACHE_MAX_BYTES
+from rag.ingest import build_vector_store_with_provenance, EMBEDDER_MODEL, CHUNK_SIZE, CHUNK_OVERLAP
+from rag.retriever import index_fingerprint
+
+_INDEX_FILE = "index.faiss"
+_CHUNKS_FILE = "chunks.json"
+_PROVENANCE_FILE = "provenance.json"
+_COMPANY_FILE = "company.json"
+_CURRENT_FILE = "CURRENT"
+_MANIFEST_FILE = "manifest.json"
+
+
+def _check_company_id(company_id: str) -> str:
+    if not isinstance(company_id, str) or not company_id:
+        raise ValueError(f"Invalid company id: {company_id!r}")
+    return company_id
+
+
+def _company_dirname(company_id: str) -> str:
+    # SHA-256 of the id: fixed length, one directory per distinct id, and safe
+    # on case-insensitive filesystems. The original id is kept in company.json.
+    return hashlib.sha256(_check_company_id(company_id).encode("utf-8")).hexdigest()
+
+
+def source_hash(extracted_texts: List[str], doc_names: Optional[List[str]] = None) -> str:
+    """
+    Identifies the inputs of a build; an index with the same hash can be reused.
+    """
+    h = hashlib.sha256()
+    h.update(f"{EMBEDDER_MODEL}|{CHUNK_SIZE}|{CHUNK_OVERLAP}".encode("utf-8"))
+    names = doc_names or [""] * len(extracted_texts)
+    for name, text in zip(names, extracted_texts):
+        h.update(b"\x00")
+        h.update(str(name).encode("utf-8"))
+        h.update(b"\x00")
+        h.update(text.encode("utf-8", errors="ignore"))
+    return h.hexdigest()
+
+
+def _estimate_bytes(index, chunks: List[str]) -> int:
+    # Flat index: ntotal * dim float32 vectors, plus the chunk text
+    return int(index.ntotal) * int(index.d) * 4 + sum(len(c) for c in chunks)
+
+
+class IndexManager:
+    """
+    Per-company retrieval indexes, persisted under `root_dir/<sha256 of company id>/`
+    and loaded on demand.
+
+    Each build is written to its own version subdirectory and published by
+    atomically replacing the `CURRENT` pointer file, so readers (in this or
+    other processes) always load an index and its chunks from the same build.
+    Within a process the newest build wins; concurrent writers for the same
+    company in different processes are not coordinated.
+
+    Loaded indexes are kept in an LRU set bounded by `max_bytes`; the least
+    recently used tenants are evicted from memory (they stay on disk).
+    All public methods are thread-safe. A single embedder is shared across
+    tenants.
+    """
+
+    def __init__(self, root_dir: str = INDEX_DIR, max_bytes: int = INDEX_CACHE_MAX_BYTES, embedder=None):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self._embedder = embedder
+        # company_id -> (index, chunks, size_bytes, version)
+        self._resident: "OrderedDict[str, Tuple[object, List[str], int, str]]" = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    # ---------- Paths ----------
+    def _company_dir(self, company_id: str) -> str:
+        return os.path.join(self.root_dir, _company_dirname(company_id))
+
+    def _current_dir(self, company_id: str) -> Optional[str]:
+        d = self._company_dir(company_id)
+        try:
+            with open(os.path.join(d, _CURRENT_FILE), "r", encoding="utf-8") as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return os.path.join(d, name) if name else None
+
+    def has_index(self, company_id: str) -> bool:
+        d = self._current_dir(company_id)
+        return d is not None and os.path.exists(os.path.join(d, _INDEX_FILE))
+
+    def list_companies(self) -> List[str]:
+        if not os.path.isdir(self.root_dir):
+            return []
+        companies = []
+        for name in os.listdir(self.root_dir):
+            p = os.path.join(self.root_dir, name, _COMPANY_FILE)
+            if not os.path.exists(p):
+                continue
+            with open(p, "r", encoding="utf-8") as f:
+                cid = json.load(f)["company_id"]
+            if self.has_index(cid):
+                companies.append(cid)
+        return sorted(companies)
+
+    # ---------- Embedder ----------
+    @property
+    def embedder(self):
+        with self._lock:
+            if self._embedder is None:
+                self._embedder = SentenceTransformer(EMBEDDER_MODEL)
+            return self._embedder
+
+    # ---------- Residency ----------
+    def _admit(self, company_id: str, index, chunks: List[str]) -> str:
+        size = _estimate_bytes(index, chunks)
+        version = index_fingerprint(index, chunks)
+        with self._lock:
+            old = self._resident.pop(company_id, None)
+            if old is not None:
+                self._resident_bytes -= old[2]
+            self._resident[company_id] = (index, chunks, size, version)
+            self._resident_bytes += size
+            # Evict cold tenants, but always keep the one just admitted
+            while self._resident_bytes > self.max_bytes and len(self._resident) > 1:
+                _, (_, _, evicted_size, _) = self._resident.popitem(last=False)
+                self._resident_bytes -= evicted_size
+        return version
+
+    def _load_lock(self, company_id: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(company_id, threading.Lock())
+
+    def evict(self, company_id: str) -> None:
+        cid = _check_company_id(company_id)
+        with self._lock:
+            old = self._resident.pop(cid, None)
+            if old is not None:
+                self._resident_bytes -= old[2]
+
+    def index_version(self, company_id: str) -> str:
+        """
+        Version tag of the company's index (see retriever.index_fingerprint),
+        for use as `retrieve_context(..., index_version=...)`.
+        """
+        return self._get_entry(_check_company_id(company_id))[3]
+
+    def resident_companies(self) -> List[str]:
+        with self._lock:
+            return list(self._resident.keys())
+
+    @property
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return self._resident_bytes
+
+    # ---------- Build / load ----------
+    def get_or_build(self, company_id: str, extracted_texts: List[str], doc_names: Optional[List[str]] = None):
+        """
+        Reuses the company's index if it was built from the same documents,
+        otherwise rebuilds it.
+        Returns: index, chunks, embedder
+        """
+        cid = _check_company_id(company_id)
+        manifest = self._read_manifest(cid)
+        if manifest is not None and manifest.get("source_hash") == source_hash(extracted_texts, doc_names):
+            try:
+                return self.get(cid)
+            except KeyError:
+                pass
+        return self.build(cid, extracted_texts, doc_names=doc_names)
+
+    def _read_manifest(self, company_id: str) -> Optional[Dict[str, Any]]:
+        vdir = self._current_dir(company_id)
+        if vdir is None:
+            return None
+        try:
+            with open(os.path.join(vdir, _MANIFEST_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def build(self, company_id: str, extracted_texts: List[str], doc_names: Optional[List[str]] = None):
+        """
+        Builds the company's index, persists it and makes it resident.
+        `doc_names` (e.g. uploaded filenames) is recorded in chunk provenance.
+        Returns: index, chunks, embedder
+        """
+        cid = _check_company_id(company_id)
+        index, chunks, embedder, provenance = build_vector_store_with_provenance(
+            extracted_texts, embedder=self.embedder, doc_names=doc_names
+        )
+
+        d = self._company_dir(cid)
+        # Version names sort by creation time; see _prune_versions
+        version = f"v-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        vdir = os.path.join(d, version)
+        os.makedirs(vdir)
+        faiss.write_index(index, os.path.join(vdir, _INDEX_FILE))
+        with open(os.path.join(vdir, _CHUNKS_FILE), "w", encoding="utf-8") as f:
+            json.dump(chunks, f, ensure_ascii=False)
+        with open(os.path.join(vdir, _PROVENANCE_FILE), "w", encoding="utf-8") as f:
+            json.dump(provenance, f, ensure_ascii=False)
+        with open(os.path.join(vdir, _MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump({"source_hash": source_hash(extracted_texts, doc_names)}, f)
+        with open(os.path.join(d, _COMPANY_FILE), "w", encoding="utf-8") as f:
+            json.dump({"company_id": cid}, f, ensure_ascii=False)
+
+        with self._load_lock(cid):
+            previous = self._current_dir(cid)
+            if previous is not None and os.path.basename(previous) > version:
+                # A newer build was published while this one ran: keep it
+                shutil.rmtree(vdir, ignore_errors=True)
+                return self.get(cid)
+            # Publishing the build is a single atomic rename of the pointer file
+            tmp_pointer = os.path.join(d, f"{_CURRENT_FILE}.{uuid.uuid4().hex}.tmp")
+            with open(tmp_pointer, "w", encoding="utf-8") as f:
+                f.write(version)
+            os.replace(tmp_pointer, os.path.join(d, _CURRENT_FILE))
+            self._admit(cid, index, chunks)
+            if previous is not None:
+                self._prune_versions(d, keep_from=os.path.basename(previous))
+
+        return index, chunks, embedder
+
+    def _prune_versions(self, company_dir: str, keep_from: str) -> None:
+        # Drop builds older than the one just replaced. The replaced build is
+        # kept so a reader that resolved the old pointer can finish loading,
+        # and newer ones may still be in progress. Since an older build never
+        # replaces a newer one, CURRENT is never older than `keep_from`.
+        for name in os.listdir(company_dir):
+            if name.startswith("v-") and name < keep_from:
+                shutil.rmtree(os.path.join(company_dir, name), ignore_errors=True)
+
+    def _read_current(self, company_id: str):
+        # A concurrent rebuild may prune the version we resolved; re-resolve
+        for _ in range(3):
+            vdir = self._current_dir(company_id)
+            if vdir is None:
+                break
+            try:
+                index = faiss.read_index(os.path.join(vdir, _INDEX_FILE))
+                with open(os.path.join(vdir, _CHUNKS_FILE), "r", encoding="utf-8") as f:
+                    chunks = json.load(f)
+                return index, chunks
+            except (FileNotFoundError, RuntimeError):
+                continue
+        raise KeyError(f"No index found for company {company_id!r}")
+
+    def _get_entry(self, cid: str):
+        # Returns the resident (index, chunks, size_bytes, version), loading it if needed
+        with self._lock:
+            hit = self._resident.get(cid)
+            if hit is not None:
+                self._resident.move_to_end(cid)
+                return hit
+
+        with self._load_lock(cid):
+            # Another thread may have loaded it while we waited
+            with self._lock:
+                hit = self._resident.get(cid)
+                if hit is not None:
+                    self._resident.move_to_end(cid)
+                    return hit
+
+            index, chunks = self._read_current(cid)
+            version = self._admit(cid, index, chunks)
+
+        return index, chunks, _estimate_bytes(index, chunks), version
+
+    def get(self, company_id: str):
+        """
+        Returns (index, chunks, embedder) for a company, loading it from disk
+        if it is not resident. Raises KeyError if no index was built.
+        """
+        index, chunks, _, _ = self._get_entry(_check_company_id(company_id))
+        return index, chunks, self.embedder
+
+    def get_provenance(self, company_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Source of every indexed chunk and of every chunk dropped as a
+        duplicate, see rag.ingest.build_vector_store_with_provenance.
+        """
+        vdir = self._current_dir(_check_company_id(company_id))
+        if vdir is None or not os.path.exists(os.path.join(vdir, _PROVENANCE_FILE)):
+            return {"sources": [], "duplicates": []}
+        with open(os.path.join(vdir, _PROVENANCE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def warm_up(self, company_ids: Iterable[str]) -> List[str]:
+        """
+        Preloads indexes for a scheduled batch. Companies without an index are
+        skipped. Returns the ids that are resident afterwards.
+        """
+        loaded = []
+        for cid in company_ids:
+            try:
+                self.get(cid)
+                loaded.append(cid)
+            except KeyError:
+                continue
+        resident = set(self.resident_companies())
+        return [c for c in loaded if c in resident]
+
+    def delete(self, company_id: str) -> None:
+        cid = _check_company_id(company_id)
+        with self._load_lock(cid):
+            self.evict(cid)
+            shutil.rmtree(self._company_dir(cid), ignore_errors=True)
+
+
+_default_manager: Optional[IndexManager] = None
+_default_lock = threading.Lock()
+
+
+def get_index_manager() -> IndexManager:
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = IndexManager()
+        return _default_manager
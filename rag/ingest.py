@@ -1,4 +1,4 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 import io
 import pdfplumber
 from docx import Document
@@ -7,8 +7,12 @@ import numpy as np
 import faiss
 
 from ocr.ocr_engine import ocr_image_bytes
+from rag.dedup import dedup_chunks
 
-def _chunk_text(text: str, chunk_size: int = 800, overlap: int = 120) -> List[str]:
+CHUNK_SIZE = 800
+CHUNK_OVERLAP = 120
+
+def _chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[str]:
     text = " ".join(text.split())
     if not text:
         return []
@@ -57,20 +61,67 @@ def extract_text_from_uploads(files) -> Tuple[List[str], List[Dict[str, Any]]]:
 
     return extracted_texts, doc_meta
 
-def build_vector_store(extracted_texts: List[str]):
+EMBEDDER_MODEL = "all-MiniLM-L6-v2"
+
+def build_vector_store(extracted_texts: List[str], embedder=None, dedup: bool = True):
     """
     Builds FAISS index over chunked text.
+    Pass an already-loaded embedder to avoid reloading the model.
+    With dedup=True, near-duplicate chunks are dropped before embedding.
     Returns: index, chunks, embedder
     """
-    embedder = SentenceTransformer("all-MiniLM-L6-v2")
+    index, chunks, embedder, _ = build_vector_store_with_provenance(
+        extracted_texts, embedder=embedder, dedup=dedup
+    )
+    return index, chunks, embedder
+
+def build_vector_store_with_provenance(extracted_texts: List[str], embedder=None,
+                                       doc_names: Optional[List[str]] = None, dedup: bool = True):
+    """
+    Same as build_vector_store, but also reports where every chunk came from.
+    Returns: index, chunks, embedder, provenance
+      provenance["sources"]: one entry per indexed chunk (aligned with chunks):
+        {doc_index, filename, chunk_index, char_offset}
+      provenance["duplicates"]: one entry per chunk dropped as a duplicate:
+        {doc_index, filename, chunk_index, char_offset, canonical_index}
+      chunk_index/char_offset locate a chunk in its document's
+      whitespace-normalized text; canonical_index is a position in chunks
+      (and sources).
+    """
+    if doc_names is not None and len(doc_names) != len(extracted_texts):
+        raise ValueError(
+            f"doc_names has {len(doc_names)} entries but there are {len(extracted_texts)} documents."
+        )
+    if embedder is None:
+        embedder = SentenceTransformer(EMBEDDER_MODEL)
 
     chunks: List[str] = []
-    for t in extracted_texts:
-        chunks.extend(_chunk_text(t))
+    origins: List[Dict[str, Any]] = []
+    for d, t in enumerate(extracted_texts):
+        doc_chunks = _chunk_text(t)
+        chunks.extend(doc_chunks)
+        origins.extend(
+            {
+                "doc_index": d,
+                "filename": doc_names[d] if doc_names is not None else None,
+                "chunk_index": i,
+                "char_offset": i * (CHUNK_SIZE - CHUNK_OVERLAP),
+            }
+            for i in range(len(doc_chunks))
+        )
 
     if not chunks:
         raise ValueError("No chunks were created from extracted text.")
 
+    sources = origins
+    duplicates: List[Dict[str, Any]] = []
+    if dedup:
+        chunks, dropped = dedup_chunks(chunks)
+        kept_positions = sorted(set(range(len(origins))) - set(dropped))
+        sources = [origins[p] for p in kept_positions]
+        for pos, canonical in sorted(dropped.items()):
+            duplicates.append({**origins[pos], "canonical_index": canonical})
+
     embs = embedder.encode(chunks, normalize_embeddings=True)
     embs = np.array(embs, dtype="float32")
 
@@ -78,4 +129,4 @@ def build_vector_store(extracted_texts: List[str]):
     index = faiss.IndexFlatIP(dim)  # cosine via normalized vectors + inner product
     index.add(embs)
 
-    return index, chunks, embedder
+    return index, chunks, embedder, {"sources": sources, "duplicates": duplicates}
@@ -1,11 +1,120 @@
-from typing import List
+from typing import List, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import threading
 import numpy as np
 
-def retrieve_context(query: str, index, chunks: List[str], embedder, top_k: int = 5) -> List[str]:
+
+def index_fingerprint(index, chunks: List[str]) -> str:
+    """
+    Version tag for an index: changes whenever the indexed chunks change,
+    so cache entries from an older build are never served.
+    """
+    h = hashlib.sha1()
+    h.update(str(getattr(index, "ntotal", len(chunks))).encode("utf-8"))
+    for c in chunks:
+        h.update(c.encode("utf-8", errors="ignore"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class QueryCache:
+    """
+    LRU cache of retrieval results, keyed by index version.
+
+    A lookup hits on an exact query hash match, or when the query embedding
+    has cosine similarity >= `similarity_threshold` with a cached query for
+    the same index version and top_k. Entries for several indexes can live
+    side by side; a rebuilt index gets a new version, and entries for the old
+    one age out through LRU eviction.
+    """
+
+    def __init__(self, max_entries: int = 256, similarity_threshold: float = 0.97):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        # (version, top_k, query_hash) -> (embedding, results)
+        self._entries: "OrderedDict[Tuple[str, int, str], Tuple[np.ndarray, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _hash(query: str) -> str:
+        return hashlib.sha1(" ".join(query.split()).encode("utf-8")).hexdigest()
+
+    def get_exact(self, version: str, top_k: int, query: str) -> Optional[List[str]]:
+        key = (version, top_k, self._hash(query))
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(hit[1])
+
+    def get_similar(self, version: str, top_k: int, q_emb: np.ndarray) -> Optional[List[str]]:
+        with self._lock:
+            best_key = None
+            best_sim = self.similarity_threshold
+            for key, (emb, _) in self._entries.items():
+                if key[0] != version or key[1] != top_k:
+                    continue
+                sim = float(np.dot(emb, q_emb))
+                if sim >= best_sim:
+                    best_sim = sim
+                    best_key = key
+            if best_key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return list(self._entries[best_key][1])
+
+    def put(self, version: str, top_k: int, query: str, q_emb: np.ndarray, results: List[str]) -> None:
+        key = (version, top_k, self._hash(query))
+        with self._lock:
+            self._entries[key] = (q_emb, list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared across Streamlit reruns (the module is imported once per process)
+default_query_cache = QueryCache()
+
+
+def retrieve_context(query: str, index, chunks: List[str], embedder, top_k: int = 5,
+                     cache: Optional[QueryCache] = default_query_cache,
+                     index_version: Optional[str] = None) -> List[str]:
+    """
+    Pass `index_version` (computed once per build/load, e.g. by IndexManager)
+    so the cache does not re-fingerprint the chunks on every call.
+    """
+    version = index_version
+    if cache is not None and version is None:
+        version = index_fingerprint(index, chunks)
+    if cache is not None:
+        cached = cache.get_exact(version, top_k, query)
+        if cached is not None:
+            return cached
+
     q = embedder.encode([query], normalize_embeddings=True).astype("float32")
+
+    if cache is not None:
+        cached = cache.get_similar(version, top_k, q[0])
+        if cached is not None:
+            return cached
+
     scores, ids = index.search(q, top_k)
     results = []
     for i in ids[0]:
         if 0 <= i < len(chunks):
             results.append(chunks[i])
+
+    if cache is not None:
+        cache.put(version, top_k, query, q[0], results)
     return results
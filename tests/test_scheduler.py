@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from analysis.scheduler import _schedule_skill, schedule_learning_path
+
+
+def _gaps(*skills):
+    return {"skill_gaps": [{"skill": s, "priority": "Medium"} for s in skills]}
+
+
+def _assignments(payload):
+    return {(a["cohort"], a["skill"]): a for a in payload["schedule"]["assignments"]}
+
+
+def test_waves_never_oversubscribe_seats():
+    rng = np.random.default_rng(0)
+    earliest = rng.integers(0, 30, size=200)
+    sizes = rng.integers(1, 15, size=200)
+    start, finish, wave_start, wave_learners = _schedule_skill(earliest, sizes, 4, 25)
+
+    assert wave_learners.max() <= 25
+    assert wave_learners.min() > 0
+    assert wave_learners.sum() == sizes.sum()
+    # One seat pool: a wave starts only after the previous one has ended
+    assert np.all(np.diff(wave_start) >= 4)
+
+
+def test_no_cohort_starts_before_it_is_ready():
+    rng = np.random.default_rng(1)
+    earliest = rng.integers(0, 50, size=500)
+    sizes = rng.integers(0, 8, size=500)
+    sizes[0] = 3
+    start, finish, _, _ = _schedule_skill(earliest, sizes, 6, 40)
+
+    taking = sizes > 0
+    assert np.all(start >= earliest)
+    assert np.all(finish[taking] >= start[taking] + 6)
+
+
+def test_partial_wave_uses_idle_capacity():
+    # y only needs C and is ready at week 4; it must not wait for x to fill a wave
+    payload = schedule_learning_path(
+        _gaps("A", "B", "C"),
+        cohorts=[
+            {"cohort": "x", "size": 10},
+            {"cohort": "y", "size": 5, "skills": ["C"]},
+            {"cohort": "z", "size": 7},
+        ],
+        prerequisites={"B": ["A"]},
+        capacity={"default": 8},
+    )
+    rows = _assignments(payload)
+    assert rows[("y", "C")]["start_week"] == 4
+
+
+def test_cohort_skills_are_serialised_and_respect_prerequisites():
+    payload = schedule_learning_path(
+        _gaps("A", "B", "C"),
+        cohorts=[{"cohort": "x", "size": 10}, {"cohort": "z", "size": 7}],
+        prerequisites={"B": ["A"]},
+        capacity={"default": 8},
+    )
+    rows = _assignments(payload)
+    for cohort in ("x", "z"):
+        spans = sorted((rows[(cohort, s)]["start_week"], rows[(cohort, s)]["end_week"]) for s in "ABC")
+        for (_, prev_end), (next_start, _) in zip(spans, spans[1:]):
+            assert next_start >= prev_end
+        assert rows[(cohort, "B")]["start_week"] >= rows[(cohort, "A")]["end_week"]
+
+
+@pytest.mark.parametrize("capacity", [{"x": 0}, {"default": -3}])
+def test_non_positive_capacity_is_rejected(capacity):
+    with pytest.raises(ValueError):
+        schedule_learning_path(_gaps("A"), capacity=capacity)
+
+
+def test_no_skill_gaps_keeps_baseline_phase_2():
+    payload = schedule_learning_path({})
+    assert payload["phases"][1]["duration_weeks"] == 6